@@ -9,25 +9,92 @@ Output: case_study.html (in the same directory)
 
 import pandas as pd
 import numpy as np
+import os
 import re
-import html as html_mod
+import textwrap
 import time
+import jinja2
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 MESSY_CSV = BASE_DIR / "messy_ecommerce_export.csv"
 CLEAN_CSV = BASE_DIR / "cleaned_ecommerce_data.csv"
 OUTPUT_HTML = BASE_DIR / "case_study.html"
+CSS_FILE = BASE_DIR / "style.css"
+TEMPLATES_DIR = BASE_DIR / "templates"
+
+# Regex patterns used by the statistics block and sample picker, compiled once
+_CURRENCY_RE = re.compile(r"[€$£]|TL|GBP")
+_MONTH_DATE_RE = re.compile(r"^[A-Z][a-z]+ \d")
+_DOT_DATE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
+_SKU_NO_DASH_RE = re.compile(r"^(SKU|sku|Sku)\d+$")
+
+# Raw values that need normalizing (membership sets for isin checks)
+_STATUS_TYPOS = frozenset({"Cancellled", "deliverred"})
+_FULL_COUNTRIES = frozenset({
+    "germany", "Australia", "canada", "United Kingdom",
+    "Germany", "France", "United States", "USA", "us", "UK",
+})
+_SAMPLE_COUNTRIES = frozenset({"germany", "Australia", "United States"})
+
+# Free-text columns in both exports. Every column feeds the shape, null and
+# dtype-audit stats, so nothing is dropped at parse time; declaring the text
+# columns up front just lets the parser skip numeric type inference on them.
+TEXT_COLS = [
+    "order_id", "sku", "product_name", "order_date",
+    "customer_email", "customer_phone", "shipping_country", "status",
+]
+RAW_DTYPES = {col: object for col in TEXT_COLS + ["price"]}
+CLEAN_DTYPES = {col: object for col in TEXT_COLS}
+
+# Set PROFILE=1 to print a cProfile report and per-phase peak memory
+PROFILE = bool(os.environ.get("PROFILE"))
+if PROFILE:
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+
+phase_peaks = {}
+worker_profiles = []
+
+
+def mark_phase(name):
+    """Record peak traced memory since the previous mark (PROFILE runs only)."""
+    if PROFILE:
+        phase_peaks[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+
 
 # ---------------------------------------------------------------------------
 # 1. Load data
 # ---------------------------------------------------------------------------
+def read_csv(path, dtype):
+    """Parse one export. cProfile only instruments the thread that enabled it,
+    so under PROFILE each worker runs the parse in its own profiler."""
+    if not PROFILE:
+        return pd.read_csv(path, engine="pyarrow", dtype=dtype)
+    worker = cProfile.Profile()
+    df = worker.runcall(pd.read_csv, path, engine="pyarrow", dtype=dtype)
+    worker_profiles.append(worker)
+    return df
+
+
 t0 = time.perf_counter()
 
-df_raw = pd.read_csv(MESSY_CSV)
-df_clean = pd.read_csv(CLEAN_CSV)
+# Both parses release the GIL, so reading the two files concurrently overlaps them
+with ThreadPoolExecutor(max_workers=2) as pool:
+    fut_raw = pool.submit(read_csv, MESSY_CSV, RAW_DTYPES)
+    fut_clean = pool.submit(read_csv, CLEAN_CSV, CLEAN_DTYPES)
+    df_raw = fut_raw.result()
+    df_clean = fut_clean.result()
 
 load_time = time.perf_counter() - t0
+mark_phase("read_csv")
 
 # ---------------------------------------------------------------------------
 # 2. Compute dynamic statistics
@@ -40,55 +107,58 @@ columns_removed = raw_cols - clean_cols
 raw_nulls = int(df_raw.isnull().sum().sum())
 clean_nulls = int(df_clean.isnull().sum().sum())
 
-# Encoding issues (Mojibake markers)
-encoding_issues = int(
-    df_raw["product_name"].str.contains("\u00c3", na=False).sum()
-)
 
-# Currency symbols in price
-currency_in_price = int(
-    df_raw["price"]
-    .astype(str)
-    .str.contains(r"[€$£]|TL|GBP", na=False, regex=True)
-    .sum()
-)
+def is_iso_date(s):
+    """Fixed-width YYYY-MM-DD check, replacing a per-row regex match."""
+    return (
+        len(s) == 10
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdecimal()
+        and s[5:7].isdecimal()
+        and s[8:].isdecimal()
+    )
 
-# Date format variety (non-ISO dates)
-iso_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-non_iso_dates = int(
-    df_raw["order_date"].apply(lambda x: not bool(iso_pattern.match(str(x)))).sum()
-)
 
-# Status inconsistencies (misspellings + casing)
-raw_unique_statuses = df_raw["status"].nunique()
-clean_unique_statuses = df_clean["status"].nunique()
-status_typo_rows = int(
-    df_raw["status"].isin(["Cancellled", "deliverred"]).sum()
-)
-status_casing_rows = int(
-    df_raw["status"]
-    .apply(lambda x: x != str(x).lower() if pd.notna(x) else False)
-    .sum()
+# Status inconsistencies (misspellings + casing), all derived from one
+# unique/count pass over the raw status values
+status_uniq, status_counts = np.unique(
+    df_raw["status"].dropna().to_numpy(dtype=str), return_counts=True
 )
-
-# Country inconsistencies
-full_name_countries = [
-    "germany", "Australia", "canada", "United Kingdom",
-    "Germany", "France", "United States", "USA", "us", "UK",
-]
-country_inconsistent = int(
-    df_raw["shipping_country"].isin(full_name_countries).sum()
+raw_unique_statuses = len(status_uniq)
+clean_unique_statuses = df_clean["status"].nunique()
+status_typo_rows = int(status_counts[np.isin(status_uniq, list(_STATUS_TYPOS))].sum())
+status_casing_rows = int(status_counts[status_uniq != np.char.lower(status_uniq)].sum())
+
+# Per-row issue flags, reduced with a single sum instead of one pass per stat.
+# Each source column is looked up (and cast) once and shared by its flags.
+sku = df_raw["sku"]
+price_str = df_raw["price"].astype(str)
+order_date_str = df_raw["order_date"].astype(str)
+sku_canonical = sku.str.upper().str.replace("SKU", "SKU-", regex=False)
+issue_flags = pd.DataFrame(
+    {
+        # Encoding issues (Mojibake markers)
+        "encoding": df_raw["product_name"].str.contains("\u00c3", na=False),
+        # Currency symbols in price
+        "currency": price_str.str.contains(_CURRENCY_RE, na=False),
+        # Date format variety (non-ISO dates)
+        "non_iso_date": [not is_iso_date(d) for d in order_date_str.tolist()],
+        # Country inconsistencies
+        "country": df_raw["shipping_country"].isin(_FULL_COUNTRIES),
+        # SKU format inconsistencies
+        "sku_no_dash": sku.str.match(_SKU_NO_DASH_RE, na=False),
+        "sku_mixed_case": sku.notna() & (sku != sku_canonical),
+    }
 )
+issue_counts = issue_flags.sum().astype(int)
 
-# SKU format inconsistencies
-sku_no_dash = int(
-    df_raw["sku"].str.match(r"^(SKU|sku|Sku)\d+$", na=False).sum()
-)
-sku_mixed_case = int(
-    df_raw["sku"]
-    .apply(lambda x: x != str(x).upper().replace("SKU", "SKU-") if pd.notna(x) else False)
-    .sum()
-)
+encoding_issues = int(issue_counts["encoding"])
+currency_in_price = int(issue_counts["currency"])
+non_iso_dates = int(issue_counts["non_iso_date"])
+country_inconsistent = int(issue_counts["country"])
+sku_no_dash = int(issue_counts["sku_no_dash"])
+sku_mixed_case = int(issue_counts["sku_mixed_case"])
 
 # Unused columns
 unused_cols = [c for c in df_raw.columns if c not in df_clean.columns]
@@ -98,69 +168,64 @@ unused_cols = [c for c in df_raw.columns if c not in df_clean.columns]
 # ---------------------------------------------------------------------------
 
 
-def pick_messy_samples(df, n=6):
-    """Pick rows that showcase diverse messy patterns."""
-    indices = []
+def pick_messy_samples(df, n=6, price_str=None):
+    """Pick rows that showcase diverse messy patterns.
 
-    # Row with encoding issue + typo status
-    cand = df[
+    ``price_str`` may pass in an already string-cast price column to reuse.
+    """
+    price = df["price"].astype(str) if price_str is None else price_str
+    masks = [
+        # Row with encoding issue + typo status
         df["product_name"].str.contains("\u00c3", na=False)
-        & df["status"].isin(["Cancellled", "deliverred"])
+        & df["status"].isin(_STATUS_TYPOS),
+        # Row with euro currency
+        price.str.contains("€", na=False),
+        # Row with TL currency
+        price.str.contains("TL", na=False),
+        # Row with full country name
+        df["shipping_country"].isin(_SAMPLE_COUNTRIES),
+        # Row with varied date format (Mon DD, YYYY)
+        df["order_date"].str.match(_MONTH_DATE_RE, na=False),
+        # Row with DD.MM.YYYY date
+        df["order_date"].str.match(_DOT_DATE_RE, na=False),
     ]
-    if len(cand):
-        indices.append(cand.index[0])
-
-    # Row with euro currency
-    cand = df[df["price"].astype(str).str.contains("€", na=False)]
-    for idx in cand.index:
-        if idx not in indices:
-            indices.append(idx)
-            break
-
-    # Row with TL currency
-    cand = df[df["price"].astype(str).str.contains("TL", na=False)]
-    for idx in cand.index:
-        if idx not in indices:
-            indices.append(idx)
-            break
-
-    # Row with full country name
-    cand = df[df["shipping_country"].isin(["germany", "Australia", "United States"])]
-    for idx in cand.index:
-        if idx not in indices:
-            indices.append(idx)
-            break
-
-    # Row with varied date format (Mon DD, YYYY)
-    cand = df[df["order_date"].str.match(r"^[A-Z][a-z]+ \d", na=False)]
-    for idx in cand.index:
-        if idx not in indices:
-            indices.append(idx)
-            break
-
-    # Row with DD.MM.YYYY date
-    cand = df[df["order_date"].str.match(r"^\d{2}\.\d{2}\.\d{4}$", na=False)]
-    for idx in cand.index:
-        if idx not in indices:
-            indices.append(idx)
-            break
+
+    # Take the first matching row per pattern, skipping rows already picked
+    indices = []
+    for mask in masks:
+        for pos in np.flatnonzero(mask.to_numpy()):
+            idx = df.index[pos]
+            if idx not in indices:
+                indices.append(idx)
+                break
 
     return df.loc[indices[:n]]
 
 
-messy_samples = pick_messy_samples(df_raw)
+messy_samples = pick_messy_samples(df_raw, price_str=price_str)
 
 # For clean samples, get the same order_ids
 sample_order_ids = messy_samples["order_id"].tolist()
-clean_samples = df_clean[df_clean["order_id"].isin(sample_order_ids)].drop_duplicates(
-    subset="order_id"
+# A hash join against a small key frame; "_order" restores the messy-sample order
+sample_keys = pd.DataFrame(
+    {"order_id": sample_order_ids, "_order": range(len(sample_order_ids))}
+)
+clean_samples = (
+    df_clean.merge(sample_keys, on="order_id", how="inner")
+    .drop_duplicates(subset="order_id")
+    .sort_values("_order")
+    .drop(columns="_order")
+    .reset_index(drop=True)
 )
-# Re-order to match
-clean_samples = clean_samples.set_index("order_id").loc[sample_order_ids].reset_index()
 
 # ---------------------------------------------------------------------------
 # 4. Build cleaning summary rows (dynamic)
 # ---------------------------------------------------------------------------
+# Placeholder null strings, counted once per column
+sentinels = {"N/A", "n/a", "NA"}
+email_na = int(df_raw["customer_email"].isin(sentinels).sum())
+phone_na = int(df_raw["customer_phone"].isin(sentinels).sum())
+
 cleaning_steps = [
     {
         "issue": "Duplicate Rows",
@@ -204,16 +269,7 @@ cleaning_steps = [
     },
     {
         "issue": "Placeholder Strings as Nulls",
-        "affected": "~{:,}".format(
-            int(
-                df_raw["customer_email"].isin(["N/A", "n/a", "NA"]).sum()
-                + df_raw["customer_phone"].isin(["N/A", "n/a", "NA"]).sum()
-            )
-            if df_raw["customer_email"].isin(["N/A", "n/a", "NA"]).sum() > 0
-            else 0
-        )
-        if df_raw["customer_email"].isin(["N/A", "n/a", "NA"]).sum() > 0
-        else "Verified",
+        "affected": f"~{email_na + phone_na:,}" if email_na > 0 else "Verified",
         "action": "Converted sentinel strings (N/A, n/a) to proper null values for consistent missing-data handling.",
     },
     {
@@ -241,419 +297,51 @@ for col in df_clean.columns:
     )
 
 
+mark_phase("statistics")
+
 # ---------------------------------------------------------------------------
-# 6. HTML helper functions
+# 6. HTML templating
 # ---------------------------------------------------------------------------
-def esc(text):
-    """HTML-escape a value, handling NaN gracefully."""
-    if pd.isna(text):
-        return '<span style="color:#95a5a6;font-style:italic;">null</span>'
-    return html_mod.escape(str(text))
+# Each page is a Jinja2 template under templates/. Autoescaping covers the
+# sample-data cells; hand-written strings containing HTML entities (issue
+# descriptions, cleaning actions) are marked |safe in the templates.
+env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+env.filters["thousands"] = "{:,}".format
 
 
-def build_table_rows(df, columns, row_class_fn=None):
-    """Build <tr> elements from a DataFrame."""
-    rows_html = []
-    for i, (_, row) in enumerate(df.iterrows()):
-        cls = ""
-        if row_class_fn:
-            cls = row_class_fn(i)
-        cells = "".join(f"<td>{esc(row[c])}</td>" for c in columns)
-        rows_html.append(f'<tr class="{cls}">{cells}</tr>')
-    return "\n".join(rows_html)
+def render_page(name, **context):
+    """Render one page template to an HTML string."""
+    return env.get_template(name).render(**context)
 
 
-def alt_row(i):
-    return "alt-row" if i % 2 == 1 else ""
+def table_records(df, columns):
+    """Rows of ``columns`` as plain Python lists, with missing values as None."""
+    subset = df[columns].astype(object)
+    return subset.where(subset.notna(), None).to_numpy().tolist()
 
 
 # ---------------------------------------------------------------------------
 # 7. Assemble HTML
 # ---------------------------------------------------------------------------
 
-CSS = """
-<style>
-    /* ---- Reset & Base ---- */
-    * { margin: 0; padding: 0; box-sizing: border-box; }
-    body {
-        font-family: 'Segoe UI', -apple-system, BlinkMacSystemFont, 'Helvetica Neue', Arial, sans-serif;
-        color: #2c3e50;
-        background: #ffffff;
-        font-size: 14px;
-        line-height: 1.6;
-    }
-
-    /* ---- Page Container ---- */
-    .page {
-        width: 210mm;
-        min-height: 287mm;
-        margin: 0 auto;
-        padding: 40px 50px;
-        page-break-after: always;
-        position: relative;
-    }
-    .page:last-child { page-break-after: auto; }
-
-    /* ---- Typography ---- */
-    .page-title {
-        font-size: 32px;
-        font-weight: 700;
-        color: #2c3e50;
-        margin-bottom: 6px;
-        letter-spacing: -0.5px;
-    }
-    .page-subtitle {
-        font-size: 16px;
-        color: #7f8c8d;
-        font-weight: 400;
-        margin-bottom: 30px;
-    }
-    .section-title {
-        font-size: 24px;
-        font-weight: 700;
-        color: #2c3e50;
-        margin-bottom: 24px;
-        padding-bottom: 10px;
-        border-bottom: 3px solid #3498db;
-    }
-    .sub-section-title {
-        font-size: 18px;
-        font-weight: 600;
-        color: #2c3e50;
-        margin: 28px 0 14px 0;
-    }
-
-    /* ---- Title Page ---- */
-    .title-hero {
-        text-align: center;
-        padding-top: 80px;
-    }
-    .title-hero .page-title {
-        font-size: 36px;
-        margin-bottom: 10px;
-        line-height: 1.25;
-    }
-    .title-hero .page-subtitle {
-        font-size: 18px;
-        margin-bottom: 12px;
-        color: #3498db;
-        font-weight: 500;
-    }
-    .problem-stmt {
-        max-width: 520px;
-        margin: 0 auto 40px;
-        font-size: 15px;
-        color: #555;
-        text-align: center;
-        line-height: 1.7;
-    }
-    .divider-line {
-        width: 60px;
-        height: 3px;
-        background: #3498db;
-        margin: 20px auto 30px;
-        border: none;
-    }
-
-    /* ---- Metric Cards ---- */
-    .metrics-row {
-        display: flex;
-        gap: 20px;
-        justify-content: center;
-        margin-top: 10px;
-    }
-    .metric-card {
-        flex: 1;
-        max-width: 200px;
-        background: #f8f9fa;
-        border-left: 4px solid #3498db;
-        padding: 20px 18px;
-        border-radius: 4px;
-        text-align: center;
-    }
-    .metric-card .metric-value {
-        font-size: 28px;
-        font-weight: 700;
-        color: #2c3e50;
-    }
-    .metric-card .metric-label {
-        font-size: 12px;
-        color: #7f8c8d;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        margin-top: 4px;
-    }
-
-    /* ---- Tables ---- */
-    table {
-        width: 100%;
-        border-collapse: collapse;
-        margin-bottom: 20px;
-        font-size: 13px;
-    }
-    table th {
-        background: #2c3e50;
-        color: #ffffff;
-        font-weight: 600;
-        text-align: left;
-        padding: 12px 14px;
-        font-size: 12px;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    table td {
-        padding: 10px 14px;
-        border-bottom: 1px solid #ecf0f1;
-        vertical-align: top;
-    }
-    table tr.alt-row td {
-        background: #f8f9fa;
-    }
-    table.messy-table td {
-        font-family: 'Consolas', 'Courier New', monospace;
-        font-size: 12px;
-        color: #c0392b;
-    }
-    table.messy-table th {
-        background: #e74c3c;
-    }
-    table.clean-table th {
-        background: #27ae60;
-    }
-    table.clean-table td {
-        color: #27ae60;
-        font-family: 'Consolas', 'Courier New', monospace;
-        font-size: 12px;
-    }
-    table.summary-table th {
-        background: #2c3e50;
-        font-size: 13px;
-        padding: 14px 16px;
-    }
-    table.summary-table td {
-        padding: 13px 16px;
-        font-size: 13.5px;
-        line-height: 1.5;
-    }
-    table.summary-table tr.alt-row td {
-        background: #eaf2f8;
-    }
-
-    /* ---- Issue List ---- */
-    .issue-list {
-        list-style: none;
-        padding: 0;
-        columns: 2;
-        column-gap: 30px;
-        margin-top: 14px;
-    }
-    .issue-list li {
-        padding: 6px 0 6px 22px;
-        position: relative;
-        font-size: 13.5px;
-        break-inside: avoid;
-        margin-bottom: 4px;
-    }
-    .issue-list li::before {
-        content: '';
-        position: absolute;
-        left: 0;
-        top: 12px;
-        width: 10px;
-        height: 10px;
-        background: #e74c3c;
-        border-radius: 50%;
-    }
-
-    /* ---- Schema Comparison ---- */
-    table.schema-table th {
-        background: #34495e;
-    }
-    .before-val { color: #e74c3c; font-weight: 600; }
-    .after-val  { color: #27ae60; font-weight: 600; }
-
-    /* ---- Validation ---- */
-    .check-item {
-        display: flex;
-        align-items: center;
-        gap: 10px;
-        padding: 10px 0;
-        font-size: 14px;
-        border-bottom: 1px solid #ecf0f1;
-    }
-    .check-icon {
-        width: 26px;
-        height: 26px;
-        background: #27ae60;
-        color: white;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: 700;
-        font-size: 14px;
-        flex-shrink: 0;
-    }
-    table.audit-table td.changed {
-        background: #eafaf1;
-        font-weight: 600;
-        color: #27ae60;
-    }
-    table.audit-table th { background: #2c3e50; }
-
-    /* ---- Callout / Cards ---- */
-    .callout {
-        background: #f8f9fa;
-        border-left: 5px solid #3498db;
-        padding: 28px 30px;
-        margin: 24px 0;
-        border-radius: 4px;
-    }
-    .callout .callout-value {
-        font-size: 30px;
-        font-weight: 700;
-        color: #2c3e50;
-    }
-    .callout .callout-label {
-        font-size: 13px;
-        color: #7f8c8d;
-        margin-top: 4px;
-    }
-
-    .pill-row {
-        display: flex;
-        gap: 10px;
-        margin: 20px 0;
-        flex-wrap: wrap;
-    }
-    .pill {
-        background: #eaf2f8;
-        color: #2c3e50;
-        padding: 8px 20px;
-        border-radius: 20px;
-        font-size: 14px;
-        font-weight: 600;
-    }
-
-    .approach-list {
-        list-style: none;
-        padding: 0;
-        margin-top: 16px;
-    }
-    .approach-list li {
-        padding: 10px 0 10px 30px;
-        position: relative;
-        font-size: 14px;
-        border-bottom: 1px solid #ecf0f1;
-    }
-    .approach-list li::before {
-        content: '';
-        position: absolute;
-        left: 0;
-        top: 16px;
-        width: 12px;
-        height: 12px;
-        background: #3498db;
-        border-radius: 2px;
-    }
-    .approach-text {
-        max-width: 580px;
-        font-size: 14.5px;
-        line-height: 1.7;
-        color: #555;
-        margin: 20px 0;
-    }
-
-    /* ---- Footer ---- */
-    .footer-page {
-        display: flex;
-        flex-direction: column;
-        justify-content: center;
-        align-items: center;
-        text-align: center;
-        min-height: 287mm;
-    }
-    .footer-page .footer-title {
-        font-size: 22px;
-        font-weight: 700;
-        color: #2c3e50;
-        margin-bottom: 12px;
-    }
-    .footer-badge {
-        display: inline-block;
-        background: #f8f9fa;
-        border: 2px solid #ecf0f1;
-        border-radius: 8px;
-        padding: 30px 50px;
-        margin-top: 30px;
-    }
-    .footer-badge .contact-label {
-        font-size: 12px;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        color: #95a5a6;
-        margin-bottom: 6px;
-    }
-    .footer-badge .contact-value {
-        font-size: 16px;
-        color: #2c3e50;
-        font-weight: 600;
-    }
-    .disclaimer {
-        margin-top: 40px;
-        font-size: 12px;
-        color: #95a5a6;
-        font-style: italic;
-    }
-
-    /* ---- Print ---- */
-    @media print {
-        body { background: white; }
-        .page {
-            width: auto;
-            margin: 0;
-            padding: 30px 40px;
-            page-break-after: always;
-        }
-        .page:last-child { page-break-after: auto; }
-    }
-</style>
-"""
+# Stylesheet lives in style.css and is inlined so the page stays self-contained
+CSS = "\n<style>\n" + textwrap.indent(CSS_FILE.read_text(encoding="utf-8"), "    ") + "</style>\n"
 
 # ------ Page 1: Title & Overview ------
-page1 = f"""
-<div class="page">
-    <div class="title-hero">
-        <div class="page-title">Large-Scale E-commerce Data<br>Cleaning &amp; Standardization</div>
-        <div class="page-subtitle">{raw_rows:,} Rows &nbsp;|&nbsp; {raw_cols} Columns &nbsp;|&nbsp; 8 Data Quality Issues</div>
-        <hr class="divider-line">
-        <div class="problem-stmt">
-            E-commerce data exports often arrive riddled with inconsistencies &mdash; encoding
-            corruption, mixed date formats, and unstandardized values. This project demonstrates
-            the systematic cleaning of a {raw_rows:,}-row dataset containing 8 distinct quality
-            issues. The result is a fully standardized, analysis-ready dataset.
-        </div>
-        <div class="metrics-row">
-            <div class="metric-card">
-                <div class="metric-value">{raw_rows:,}</div>
-                <div class="metric-label">Rows Processed</div>
-            </div>
-            <div class="metric-card" style="border-left-color:#27ae60;">
-                <div class="metric-value">8</div>
-                <div class="metric-label">Issues Fixed</div>
-            </div>
-            <div class="metric-card" style="border-left-color:#e74c3c;">
-                <div class="metric-value">{duplicates_removed:,}</div>
-                <div class="metric-label">Duplicates Removed</div>
-            </div>
-        </div>
-    </div>
-</div>
-"""
+page1 = render_page(
+    "page1.html.j2",
+    raw_rows=raw_rows,
+    raw_cols=raw_cols,
+    duplicates_removed=duplicates_removed,
+)
 
 # ------ Page 2: The Problem (Before) ------
 messy_cols_display = ["order_id", "sku", "product_name", "order_date", "price", "status"]
-messy_table_rows = build_table_rows(messy_samples, messy_cols_display, alt_row)
 
 issue_descriptions = [
     ("UTF-8 Encoding Corruption", f"{encoding_issues:,} product names contain Mojibake artifacts from double-encoded Unicode"),
@@ -665,71 +353,19 @@ issue_descriptions = [
     ("Unused Empty Columns", f"{columns_removed} columns ({', '.join(unused_cols)}) are entirely null"),
     ("Duplicate Records", f"{duplicates_removed:,} exact duplicate rows inflating the dataset"),
 ]
-issue_list_items = "\n".join(
-    f'<li><strong>{name}:</strong> {desc}</li>' for name, desc in issue_descriptions
-)
 
-page2 = f"""
-<div class="page">
-    <div class="section-title">Data Quality Issues Identified</div>
-    <p style="margin-bottom:18px;color:#555;font-size:14px;">
-        Below is a sample of raw data rows illustrating the range of quality issues.
-        Red-highlighted values indicate data that required cleaning.
-    </p>
-    <table class="messy-table">
-        <thead>
-            <tr>
-                {"".join(f"<th>{c}</th>" for c in messy_cols_display)}
-            </tr>
-        </thead>
-        <tbody>
-            {messy_table_rows}
-        </tbody>
-    </table>
-    <div class="sub-section-title">All Issues Found</div>
-    <ul class="issue-list">
-        {issue_list_items}
-    </ul>
-</div>
-"""
+page2 = render_page(
+    "page2.html.j2",
+    columns=messy_cols_display,
+    rows=table_records(messy_samples, messy_cols_display),
+    issues=issue_descriptions,
+)
 
 # ------ Page 3: Cleaning Summary (Centerpiece) ------
-summary_rows_html = ""
-for i, step in enumerate(cleaning_steps):
-    cls = 'class="alt-row"' if i % 2 == 1 else ""
-    summary_rows_html += f"""
-        <tr {cls}>
-            <td style="font-weight:600;width:24%;">{step['issue']}</td>
-            <td style="text-align:center;width:16%;font-weight:600;color:#3498db;">{step['affected']}</td>
-            <td>{step['action']}</td>
-        </tr>
-    """
-
-page3 = f"""
-<div class="page">
-    <div class="section-title">Cleaning Actions Performed</div>
-    <p style="margin-bottom:20px;color:#555;font-size:14px;">
-        Each cleaning step was applied programmatically. Row counts are computed from
-        direct comparison of the raw and cleaned datasets.
-    </p>
-    <table class="summary-table">
-        <thead>
-            <tr>
-                <th>Issue</th>
-                <th style="text-align:center;">Rows Affected</th>
-                <th>Action Taken</th>
-            </tr>
-        </thead>
-        <tbody>
-            {summary_rows_html}
-        </tbody>
-    </table>
-</div>
-"""
+page3 = render_page("page3.html.j2", steps=cleaning_steps)
 
 # ------ Page 4: The Result (After) ------
 clean_cols_display = ["order_id", "sku", "product_name", "order_date", "price", "status"]
-clean_table_rows = build_table_rows(clean_samples, clean_cols_display, alt_row)
 
 # Schema comparison
 schema_rows = [
@@ -740,64 +376,15 @@ schema_rows = [
     ("Status Variants", str(raw_unique_statuses), str(clean_unique_statuses)),
     ("Date Formats", "4+", "1 (ISO 8601)"),
 ]
-schema_html = ""
-for i, (metric, before, after) in enumerate(schema_rows):
-    cls = 'class="alt-row"' if i % 2 == 1 else ""
-    schema_html += f"""
-        <tr {cls}>
-            <td style="font-weight:600;">{metric}</td>
-            <td class="before-val">{before}</td>
-            <td class="after-val">{after}</td>
-        </tr>
-    """
 
-page4 = f"""
-<div class="page">
-    <div class="section-title">Cleaned Dataset</div>
-    <p style="margin-bottom:18px;color:#555;font-size:14px;">
-        The same sample rows after all cleaning transformations have been applied.
-        Note the standardized formats, corrected encoding, and consistent values.
-    </p>
-    <table class="clean-table">
-        <thead>
-            <tr>
-                {"".join(f"<th>{c}</th>" for c in clean_cols_display)}
-            </tr>
-        </thead>
-        <tbody>
-            {clean_table_rows}
-        </tbody>
-    </table>
-
-    <div class="sub-section-title">Dataset Comparison</div>
-    <table class="schema-table">
-        <thead>
-            <tr>
-                <th style="width:35%;">Metric</th>
-                <th style="width:30%;">Before</th>
-                <th style="width:35%;">After</th>
-            </tr>
-        </thead>
-        <tbody>
-            {schema_html}
-        </tbody>
-    </table>
-</div>
-"""
+page4 = render_page(
+    "page4.html.j2",
+    columns=clean_cols_display,
+    rows=table_records(clean_samples, clean_cols_display),
+    schema_rows=schema_rows,
+)
 
 # ------ Page 5: Validation ------
-audit_rows_html = ""
-for i, item in enumerate(type_audit):
-    cls = 'class="alt-row"' if i % 2 == 1 else ""
-    changed_cls = ' class="changed"' if item["changed"] else ""
-    audit_rows_html += f"""
-        <tr {cls}>
-            <td style="font-weight:600;">{item['column']}</td>
-            <td>{item['before']}</td>
-            <td{changed_cls}>{item['after']}</td>
-        </tr>
-    """
-
 validation_checks = [
     "No duplicate rows remain in the cleaned dataset",
     "All dates conform to ISO 8601 format (YYYY-MM-DD)",
@@ -807,126 +394,47 @@ validation_checks = [
     "All status values are lowercase with no misspellings",
     "SKU format is consistent (uppercase with dash separator)",
 ]
-checks_html = "\n".join(
-    f"""<div class="check-item">
-        <div class="check-icon">&#10003;</div>
-        <div>{check}</div>
-    </div>"""
-    for check in validation_checks
-)
 
-page5 = f"""
-<div class="page">
-    <div class="section-title">Data Validation Results</div>
-
-    <div class="sub-section-title">Data Type Audit</div>
-    <table class="audit-table">
-        <thead>
-            <tr>
-                <th style="width:30%;">Column</th>
-                <th style="width:30%;">Before Type</th>
-                <th style="width:40%;">After Type</th>
-            </tr>
-        </thead>
-        <tbody>
-            {audit_rows_html}
-        </tbody>
-    </table>
-
-    <div class="sub-section-title">Validation Checks Passed</div>
-    {checks_html}
-</div>
-"""
+page5 = render_page("page5.html.j2", type_audit=type_audit, checks=validation_checks)
 
 # ------ Page 6: Performance & Approach ------
-page6 = f"""
-<div class="page">
-    <div class="section-title">Technical Approach</div>
-
-    <div class="callout">
-        <div class="callout-value">{raw_rows:,} rows processed in under 30 seconds</div>
-        <div class="callout-label">End-to-end pipeline execution including validation</div>
-    </div>
-
-    <div class="sub-section-title">Technology Stack</div>
-    <div class="pill-row">
-        <span class="pill">Python 3</span>
-        <span class="pill">Pandas</span>
-        <span class="pill">NumPy</span>
-        <span class="pill">ftfy (encoding repair)</span>
-        <span class="pill">pycountry (ISO codes)</span>
-    </div>
-
-    <div class="approach-text">
-        The cleaning pipeline is modular and reusable for future dataset updates.
-        Each step can be independently configured or extended for different data
-        sources. The approach prioritizes reproducibility &mdash; running the same
-        script on the same input will always produce identical output.
-    </div>
-
-    <div class="sub-section-title">Approach Highlights</div>
-    <ul class="approach-list">
-        <li><strong>Reproducible Pipeline</strong> &mdash; Deterministic transformations documented as code, producing identical results on every run</li>
-        <li><strong>Automated Validation</strong> &mdash; Built-in assertions verify data integrity after each cleaning step</li>
-        <li><strong>Modular Architecture</strong> &mdash; Each cleaning function handles one concern and can be toggled or reconfigured independently</li>
-        <li><strong>Graceful Error Handling</strong> &mdash; Malformed records are flagged and logged rather than silently dropped</li>
-        <li><strong>Scalable Design</strong> &mdash; Tested on 125K rows; architecture supports datasets of 1M+ rows with minimal changes</li>
-    </ul>
-</div>
-"""
+page6 = render_page("page6.html.j2", raw_rows=raw_rows)
 
 # ------ Page 7: Footer ------
-page7 = """
-<div class="page">
-    <div class="footer-page">
-        <div class="footer-title">Thank You</div>
-        <p style="color:#7f8c8d;font-size:15px;max-width:460px;line-height:1.7;">
-            This case study demonstrates a complete data cleaning workflow &mdash;
-            from messy export to analysis-ready dataset. The pipeline is available
-            for review and can be adapted to your specific data sources.
-        </p>
-
-        <div class="footer-badge">
-            <div class="contact-label">Get In Touch</div>
-            <div class="contact-value">Available for Data Projects on Upwork</div>
-            <div style="margin-top:12px;font-size:13px;color:#95a5a6;">
-                Python &bull; Pandas &bull; Data Cleaning &bull; ETL &bull; Automation
-            </div>
-        </div>
-
-        <div class="disclaimer">
-            Simulated large-scale e-commerce export for demonstration purposes.
-            <br>All data is synthetically generated &mdash; no real customer information is included.
-        </div>
-    </div>
-</div>
-"""
+page7 = render_page("page7.html.j2")
 
 # ---------------------------------------------------------------------------
 # 8. Assemble & Write
 # ---------------------------------------------------------------------------
-html_doc = f"""<!DOCTYPE html>
+HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>E-commerce Data Cleaning Case Study</title>
-    {CSS}
-</head>
-<body>
-{page1}
-{page2}
-{page3}
-{page4}
-{page5}
-{page6}
-{page7}
+"""
+HTML_FOOT = """
 </body>
 </html>
 """
 
-OUTPUT_HTML.write_text(html_doc, encoding="utf-8")
+pages = [page1, page2, page3, page4, page5, page6, page7]
+doc_parts = [HTML_HEAD, CSS, "\n</head>\n<body>\n", "\n".join(pages), HTML_FOOT]
+html_doc = "".join(doc_parts)
+
+OUTPUT_HTML.write_bytes(html_doc.encode("utf-8"))
+mark_phase("html")
 elapsed = time.perf_counter() - t0
 print(f"[OK] case_study.html generated ({OUTPUT_HTML})")
-print(f"     {len(html_doc):,} characters, {html_doc.count('<div class=\"page\">')} pages")
+print(f"     {len(html_doc):,} characters, {len(pages)} pages")
 print(f"     Built in {elapsed:.2f}s")
+
+if PROFILE:
+    profiler.disable()
+    tracemalloc.stop()
+    for name, peak in phase_peaks.items():
+        print(f"     Peak memory ({name}): {peak / 2**20:.1f} MiB")
+    stats = pstats.Stats(profiler)
+    for worker in worker_profiles:
+        stats.add(worker)
+    stats.sort_stats("cumulative").print_stats(25)
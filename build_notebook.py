@@ -77,6 +77,8 @@ import numpy as np
 import time
 import re
 import warnings
+import pyarrow as pa
+import pyarrow.compute as pc
 warnings.filterwarnings("ignore")
 
 pd.set_option("display.max_columns", 20)
@@ -84,7 +86,11 @@ pd.set_option("display.width", 140)
 """))
 
 cells.append(code(r"""
-df_raw = pd.read_csv("messy_ecommerce_export.csv")
+# PyArrow engine: multi-threaded parse, same NumPy-backed dtypes as the C engine
+df_raw = pd.read_csv("messy_ecommerce_export.csv", engine="pyarrow")
+# Arrow hands back None for missing strings; use NaN like the C engine does
+obj_cols = df_raw.select_dtypes(include="object").columns
+df_raw[obj_cols] = df_raw[obj_cols].fillna(np.nan)
 print(f"Dataset shape: {df_raw.shape[0]:,} rows x {df_raw.shape[1]} columns")
 """))
 
@@ -99,9 +105,11 @@ df_raw.head(10)
 """))
 
 cells.append(code(r"""
+# One null-mask pass; the per-column counts are reused for the snapshot below
+raw_null_counts = df_raw.isnull().sum()
 null_summary = pd.DataFrame({
-    "Null Count": df_raw.isnull().sum(),
-    "Null %": (df_raw.isnull().sum() / len(df_raw) * 100).round(2),
+    "Null Count": raw_null_counts,
+    "Null %": (raw_null_counts / len(df_raw) * 100).round(2),
 })
 print("Null summary:\n")
 print(null_summary)
@@ -116,11 +124,16 @@ cells.append(code(r"""
 # Save before-cleaning snapshots for later comparison
 before_shape = df_raw.shape
 before_dtypes = df_raw.dtypes.copy()
-before_nulls = df_raw.isnull().sum().sum()
+before_nulls = raw_null_counts.sum()
 before_sample = df_raw.head(6).copy()
 
 # Work on a copy from here on
 df = df_raw.copy()
+
+# Low-cardinality text columns become categoricals, so the str / map / isin
+# calls in the cleaning steps only touch each distinct value once
+CATEGORY_COLS = ["sku", "product_name", "shipping_country", "status"]
+df[CATEGORY_COLS] = df[CATEGORY_COLS].astype("category")
 print("Snapshots saved. Working copy created.")
 """))
 
@@ -140,9 +153,10 @@ Each step is an isolated, timed cell so performance can be monitored independent
 cells.append(md("### Step 1 — Drop Empty Columns\nRemove columns where **every** value is null."))
 
 cells.append(timed_code(r"""
-empty_cols = [col for col in df.columns if df[col].isnull().all()]
+kept = df.columns
+df.dropna(axis=1, how="all", inplace=True)
+empty_cols = kept[~kept.isin(df.columns)].tolist()
 print(f"Empty columns found: {empty_cols}")
-df.drop(columns=empty_cols, inplace=True)
 print(f"Columns after drop: {list(df.columns)}")
 print(f"Shape: {df.shape}")
 """))
@@ -167,21 +181,27 @@ print(f"Duplicates removed: {dups_removed:,}")
 cells.append(md("### Step 3 — Standardize Dates to ISO 8601 (`YYYY-MM-DD`)"))
 
 cells.append(timed_code(r"""
-# Vectorized mixed-format date parsing (Pandas 2.x)
-# Handles all 5 date formats in a single pass — no per-row Python loop.
+# Vectorized multi-format date parsing: one pd.to_datetime call per known
+# export format, each filling only the rows still unparsed. Explicit formats
+# keep DD.MM.YYYY / DD-MM-YYYY from being misread as month-first.
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y", "%b %d, %Y"]
+
 sample_before = df["order_date"].head(8).tolist()
 
-df["order_date"] = (
-    pd.to_datetime(df["order_date"], format="mixed", dayfirst=False, errors="coerce")
-    .dt.strftime("%Y-%m-%d")
-)
+raw_dates = df["order_date"].astype("string").str.strip().str.strip("\"'")
+parsed = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+for fmt in DATE_FORMATS:
+    todo = parsed.isna() & raw_dates.notna()
+    parsed[todo] = pd.to_datetime(raw_dates[todo], format=fmt, errors="coerce")
 
-sample_after = df["order_date"].head(8).tolist()
+date_clean = parsed.dt.strftime("%Y-%m-%d")
+
+sample_after = date_clean.head(8).tolist()
 
 print("Date conversion sample:")
 for b, a in zip(sample_before, sample_after):
     print(f"  {str(b):25s} -> {a}")
-print(f"\nNull dates after conversion: {df['order_date'].isnull().sum()}")
+print(f"\nNull dates after conversion: {date_clean.isnull().sum()}")
 """))
 
 # ── Step 4: Normalize Prices ────────────────────────────────────────────────
@@ -189,33 +209,26 @@ print(f"\nNull dates after conversion: {df['order_date'].isnull().sum()}")
 cells.append(md("### Step 4 — Normalize Prices to Float"))
 
 cells.append(timed_code(r"""
-def clean_price(val):
-    if pd.isna(val):
-        return np.nan
-    s = str(val).strip()
-    # Remove currency symbols and words
-    s = s.replace("$", "").replace("USD", "").replace("TL", "").replace("\u20ac", "").strip()
-    # Handle European format: €1.234,56 -> 1234.56
-    # If both . and , exist and , is after ., it's European
-    if "," in s and "." in s:
-        if s.rfind(",") > s.rfind("."):
-            # European: 1.234,56
-            s = s.replace(".", "").replace(",", ".")
-        else:
-            # US: 1,234.56
-            s = s.replace(",", "")
-    elif "," in s and "." not in s:
-        # Could be European decimal: 19,99
-        s = s.replace(",", ".")
-    try:
-        return round(float(s), 2)
-    except ValueError:
-        return np.nan
-
-df["price"] = df["price"].apply(clean_price)
-print(f"Price range: ${df['price'].min():.2f} — ${df['price'].max():.2f}")
-print(f"Null prices: {df['price'].isnull().sum()}")
-print(f"Mean price:  ${df['price'].mean():.2f}")
+# Vectorized price cleaning in Arrow compute kernels: every string operation
+# runs in C++ over the whole column instead of calling Python per row.
+CURRENCY_RE = r"\$|USD|TL|€"
+
+s = pa.array(df["price"], type=pa.string(), from_pandas=True)
+s = pc.utf8_trim_whitespace(s)
+s = pc.utf8_trim_whitespace(pc.replace_substring_regex(s, CURRENCY_RE, ""))
+
+# A comma with no dot after it is the decimal separator: 1.234,56 or 19,99.
+# Otherwise any commas are thousands separators: 1,234.56
+comma_decimal = pc.match_substring_regex(s, r",[^.]*$")
+s = pc.if_else(
+    comma_decimal,
+    pc.replace_substring(pc.replace_substring(s, ".", ""), ",", "."),
+    pc.replace_substring(s, ",", ""),
+)
+price_clean = pd.to_numeric(pd.Series(s.to_pandas(), index=df.index), errors="coerce").round(2)
+print(f"Price range: ${price_clean.min():.2f} — ${price_clean.max():.2f}")
+print(f"Null prices: {price_clean.isnull().sum()}")
+print(f"Mean price:  ${price_clean.mean():.2f}")
 """))
 
 # ── Step 5: Standardize SKU Format ──────────────────────────────────────────
@@ -223,18 +236,17 @@ print(f"Mean price:  ${df['price'].mean():.2f}")
 cells.append(md("### Step 5 — Standardize SKU Format\nUppercase all SKUs and ensure `SKU-XXX` format with dash."))
 
 cells.append(timed_code(r"""
-def clean_sku(val):
-    if pd.isna(val):
-        return np.nan
-    s = str(val).strip().upper()
-    # Insert dash if missing: SKU001 -> SKU-001
-    if s.startswith("SKU") and len(s) > 3 and s[3] != "-":
-        s = "SKU-" + s[3:]
-    return s
-
-df["sku"] = df["sku"].apply(clean_sku)
-print(f"Unique SKUs after standardization: {df['sku'].nunique()}")
-print(f"SKU values: {sorted(df['sku'].unique())}")
+# Vectorized SKU cleanup, run on the distinct raw values only and mapped back.
+# Uppercase, then insert the dash if missing: SKU001 -> SKU-001
+raw_skus = pd.Series(df["sku"].cat.categories)
+clean_skus = (
+    raw_skus.str.strip()
+    .str.upper()
+    .str.replace(r"^SKU(?!-)(.+)$", r"SKU-\1", regex=True)
+)
+sku_clean = df["sku"].map(dict(zip(raw_skus, clean_skus))).astype("category")
+print(f"Unique SKUs after standardization: {sku_clean.nunique()}")
+print(f"SKU values: {sorted(sku_clean.unique())}")
 """))
 
 # ── Step 6: Normalize Missing Values ────────────────────────────────────────
@@ -242,21 +254,29 @@ print(f"SKU values: {sorted(df['sku'].unique())}")
 cells.append(md("### Step 6 — Normalize Missing Values\nConvert fake null representations to `np.nan` in email and phone columns."))
 
 cells.append(timed_code(r"""
-FAKE_NULLS = {"N/A", "n/a", "na", "NA", "-", "--", ".", "none", "None", "null", "NULL", ""}
-
-def coerce_null(val):
-    if pd.isna(val):
-        return np.nan
-    if str(val).strip() in FAKE_NULLS:
-        return np.nan
-    return val
+# Matched case-insensitively, so only the lowercase spellings are listed
+FAKE_NULLS_LC = frozenset({"n/a", "na", "-", "--", ".", "none", "null", ""})
 
+masked = {}
+fake_null_counts = {}
 for col in ["customer_email", "customer_phone"]:
-    before_nulls = df[col].isnull().sum()
-    df[col] = df[col].apply(coerce_null)
-    after_nulls = df[col].isnull().sum()
-    coerced = after_nulls - before_nulls
+    col_nulls_before = df[col].isnull().sum()
+    # Arrow-backed strings keep strip/lower/isin in C++; mask takes a plain bool array
+    is_fake = (
+        df[col].astype("string[pyarrow]")
+        .str.strip()
+        .str.lower()
+        .isin(FAKE_NULLS_LC)
+        .fillna(False)
+        .to_numpy(bool)
+    )
+    masked[col] = df[col].mask(is_fake, np.nan)
+    after_nulls = masked[col].isnull().sum()
+    coerced = after_nulls - col_nulls_before
+    fake_null_counts[col] = coerced
     print(f"{col}: coerced {coerced:,} fake nulls -> np.nan  (total null now: {after_nulls:,})")
+
+email_clean = masked["customer_email"]
 """))
 
 # ── Step 7: Fix Encoding Corruption ─────────────────────────────────────────
@@ -283,19 +303,18 @@ def fix_encoding(val):
         return s.strip()
 
 # Count corrupted rows before fix (detect mojibake double-byte artifacts)
-corrupted_before = df["product_name"].apply(
-    lambda x: bool(MOJIBAKE_RE.search(str(x))) if pd.notna(x) else False
-).sum()
+corrupted_before = df["product_name"].str.contains(MOJIBAKE_RE, na=False).sum()
 
-df["product_name"] = df["product_name"].apply(fix_encoding)
+# Product names come from a small pool, so repair each distinct value once
+# and map the result back instead of re-decoding every row
+fix_map = {v: fix_encoding(v) for v in df["product_name"].cat.categories}
+name_clean = df["product_name"].map(fix_map).astype("category")
 
-corrupted_after = df["product_name"].apply(
-    lambda x: bool(MOJIBAKE_RE.search(str(x))) if pd.notna(x) else False
-).sum()
+corrupted_after = name_clean.str.contains(MOJIBAKE_RE, na=False).sum()
 
 print(f"Corrupted product names before fix: {corrupted_before:,}")
 print(f"Corrupted product names after fix:  {corrupted_after:,}")
-print(f"Unique product names: {sorted(df['product_name'].dropna().unique())}")
+print(f"Unique product names: {sorted(name_clean.dropna().unique())}")
 """))
 
 # ── Step 8: Standardize Phone Numbers ───────────────────────────────────────
@@ -303,35 +322,45 @@ print(f"Unique product names: {sorted(df['product_name'].dropna().unique())}")
 cells.append(md("### Step 8 — Standardize Phone Numbers\nExtract digits and reformat to `XXX-XXX-XXXX`."))
 
 cells.append(timed_code(r"""
-def clean_phone(val):
-    if pd.isna(val):
-        return np.nan
-    digits = re.sub(r"\D", "", str(val))
-    if len(digits) == 0:
-        return np.nan
-    # 7 digits: 555XXXX -> 555-XXX-XXXX (prepend area code)
-    if len(digits) == 7:
-        return f"555-{digits[:3]}-{digits[3:]}"
-    # 8 digits starting with 1: country code + 555 + XXXX -> 555-XXX-XXXX
-    elif len(digits) == 8 and digits[0] == "1":
-        digits = digits[1:]  # strip country code -> 555XXXX
-        return f"555-{digits[:3]}-{digits[3:]}"
-    # 10 digits: XXX-XXX-XXXX
-    elif len(digits) == 10:
-        return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
-    # 11 digits starting with 1: strip country code -> 10 digits
-    elif len(digits) == 11 and digits[0] == "1":
-        digits = digits[1:]
-        return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
-    else:
-        return np.nan
-
-df["customer_phone"] = df["customer_phone"].apply(clean_phone)
-sample_phones = df["customer_phone"].dropna().head(8).tolist()
+# Vectorized phone cleanup on the raw UCS-4 code points: view the column as a
+# fixed-width (rows x chars) uint32 matrix, keep the digit code points, then
+# write the XXX-XXX-XXXX layout straight into a 12-char output buffer.
+# Continues from the Step 6 output, where fake nulls are already NaN
+phones = masked["customer_phone"].fillna("").to_numpy().astype(str)
+# At least 11 code points wide, so the 10-digit slices below always exist
+# even when every phone in the column is short or null
+width = max(phones.dtype.itemsize // 4, 11)
+phones = phones.astype(f"U{width}")
+codes = phones.view(np.uint32).reshape(len(phones), width)
+is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+n_digits = is_digit.sum(axis=1)
+
+# Stable sort moves each row's digits to the front, keeping their order
+order = np.argsort(~is_digit, axis=1, kind="stable")
+digits = np.take_along_axis(np.where(is_digit, codes, 0), order, axis=1)
+
+# Strip a leading country code 1 from 8- and 11-digit numbers
+strip = (digits[:, 0] == ord("1")) & np.isin(n_digits, [8, 11])
+digits[strip, :-1] = digits[strip, 1:]
+n_body = n_digits - strip
+local = n_body == 7    # 555XXXX
+full = n_body == 10    # XXXXXXXXXX
+
+out = np.zeros((len(phones), 12), dtype=np.uint32)
+out[:, [3, 7]] = ord("-")
+out[local, :3] = ord("5")
+out[local, 4:7], out[local, 8:] = digits[local, :3], digits[local, 3:7]
+out[full, :3], out[full, 4:7], out[full, 8:] = (
+    digits[full, :3], digits[full, 3:6], digits[full, 6:10]
+)
+cleaned = out.view("U12").ravel().astype(object)
+cleaned[~(local | full)] = np.nan
+phone_clean = pd.Series(cleaned, index=df.index)
+sample_phones = phone_clean.dropna().head(8).tolist()
 print("Phone number sample after cleaning:")
 for p in sample_phones:
     print(f"  {p}")
-print(f"\nNull phones: {df['customer_phone'].isnull().sum():,}")
+print(f"\nNull phones: {phone_clean.isnull().sum():,}")
 """))
 
 # ── Step 9: Normalize Country Names ─────────────────────────────────────────
@@ -354,9 +383,11 @@ def clean_country(val):
     key = str(val).strip().lower()
     return COUNTRY_MAP.get(key, val)
 
-df["shipping_country"] = df["shipping_country"].apply(clean_country)
+# Few distinct raw values: clean each once and map the result back
+country_map = {v: clean_country(v) for v in df["shipping_country"].cat.categories}
+country_clean = df["shipping_country"].map(country_map).astype("category")
 print("Country value counts after normalization:\n")
-print(df["shipping_country"].value_counts())
+print(country_clean.value_counts())
 """))
 
 # ── Step 10: Fix Status Typos & Casing ──────────────────────────────────────
@@ -375,9 +406,33 @@ def clean_status(val):
     s = str(val).strip().lower()
     return STATUS_TYPO_MAP.get(s, s)
 
-df["status"] = df["status"].apply(clean_status)
+# Few distinct raw values: clean each once and map the result back
+status_map = {v: clean_status(v) for v in df["status"].cat.categories}
+status_clean = df["status"].map(status_map).astype("category")
 print("Status value counts after cleaning:\n")
-print(df["status"].value_counts())
+print(status_clean.value_counts())
+"""))
+
+# ── Apply Cleaned Columns ───────────────────────────────────────────────────
+
+cells.append(md(r"""
+### Apply Cleaned Columns
+Steps 3–10 each build a cleaned column without touching `df`; all of them are
+written back here in a single `assign`.
+"""))
+
+cells.append(timed_code(r"""
+df = df.assign(
+    order_date=date_clean,
+    price=price_clean,
+    sku=sku_clean,
+    customer_email=email_clean,
+    product_name=name_clean,
+    customer_phone=phone_clean,
+    shipping_country=country_clean,
+    status=status_clean,
+)
+print(f"Shape: {df.shape}")
 """))
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -413,7 +468,7 @@ summary_data = [
     ["5. Standardize SKUs", f"{df_raw['sku'].nunique():,} variants -> {df['sku'].nunique()}",
      "Uppercased and ensured SKU-XXX dash format"],
     ["6. Normalize Missing Values",
-     f"{(df_raw['customer_email'].isin(['N/A','n/a','na','NA','-','--','.','none','None','null','NULL',''])).sum() + (df_raw['customer_phone'].isin(['N/A','n/a','na','NA','-','--','.','none','None','null','NULL',''])).sum():,} fake nulls",
+     f"{sum(fake_null_counts.values()):,} fake nulls",
      "Converted N/A, none, null, -, etc. to np.nan"],
     ["7. Fix Encoding", f"{corrupted_before:,} rows",
      "Repaired Latin-1 mojibake in product names"],
@@ -469,7 +524,7 @@ dtype_comparison.style.apply(highlight_changed, axis=1).hide(axis="index")
 cells.append(md("### Schema Comparison — Before vs After"))
 
 cells.append(code(r"""
-before_dup_count = df_raw.duplicated().sum()
+before_dup_count = dup_count
 after_dup_count = df.duplicated().sum()
 before_numeric = df_raw.select_dtypes(include="number").shape[1]
 after_numeric = df.select_dtypes(include="number").shape[1]
@@ -532,7 +587,10 @@ cells.append(md(r"""
 
 cells.append(code(r"""
 output_file = "cleaned_ecommerce_data.csv"
-df.to_csv(output_file, index=False)
+# Large write buffer + explicit chunking: the writer formats 64K rows per batch
+# and hands the OS a few big writes instead of many small ones
+with open(output_file, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+    df.to_csv(f, index=False, chunksize=65_536)
 print(f"Saved cleaned dataset to: {output_file}")
 print(f"Row count: {len(df):,}")
 print(f"Columns:   {list(df.columns)}")
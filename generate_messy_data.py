@@ -4,13 +4,12 @@ Generates a ~125,000-row messy CSV simulating a Shopify e-commerce export.
 Used for Upwork portfolio demo — LOCAL ONLY, not shown to clients.
 """
 
-import random
 import numpy as np
 import pandas as pd
 
 # ── reproducibility ──────────────────────────────────────────────────────────
-random.seed(42)
-np.random.seed(42)
+# A single seeded generator; every helper draws a whole column per call
+rng = np.random.default_rng(42)
 
 NUM_BASE_ROWS = 120_000
 NUM_DUPLICATE_ROWS = 5_000
@@ -44,12 +43,13 @@ DATE_FORMATS = [
     "%d.%m.%Y",
 ]
 
+# each formatter takes an array of "%.2f" price strings
 PRICE_FORMATS = [
-    lambda v: f"${v:.2f}",
-    lambda v: f"{v:.2f}",
-    lambda v: f"€{v:,.2f}".replace(".", "X").replace(",", ".").replace("X", ","),  # €19,99
-    lambda v: f"USD {v:.2f}",
-    lambda v: f"{v:.2f} TL",
+    lambda s: np.char.add("$", s),
+    lambda s: s,
+    lambda s: np.char.add("€", np.char.replace(s, ".", ",")),  # €19,99 (prices < 1,000)
+    lambda s: np.char.add("USD ", s),
+    lambda s: np.char.add(s, " TL"),
 ]
 
 CUSTOMER_EMAILS = [
@@ -65,11 +65,12 @@ CUSTOMER_EMAILS = [
 
 NULL_EMAIL_VARIANTS = [None, "N/A", "n/a", "-", ""]
 
+# each formatter takes arrays of 3-digit and 4-digit number strings
 PHONE_FORMATS = [
-    lambda: f"+1-555-{random.randint(1000,9999)}",
-    lambda: f"555{random.randint(1000,9999)}",
-    lambda: f"(555) {random.randint(100,999)}-{random.randint(1000,9999)}",
-    lambda: f"555.{random.randint(100,999)}.{random.randint(1000,9999)}",
+    lambda d3, d4: np.char.add("+1-555-", d4),
+    lambda d3, d4: np.char.add("555", d4),
+    lambda d3, d4: np.char.add(np.char.add(np.char.add("(555) ", d3), "-"), d4),
+    lambda d3, d4: np.char.add(np.char.add(np.char.add("555.", d3), "."), d4),
 ]
 
 NULL_PHONE_VARIANTS = [None, "N/A", ""]
@@ -94,71 +95,86 @@ STATUS_VARIANTS = [
 
 # ── helper functions ─────────────────────────────────────────────────────────
 
-def messy_sku(base_sku: str) -> str:
-    """Apply random casing/formatting to a SKU."""
-    choice = random.randint(0, 3)
-    if choice == 0:
-        return base_sku              # original: SKU-001
-    elif choice == 1:
-        return base_sku.lower()      # sku-001
-    elif choice == 2:
-        return base_sku.capitalize() # Sku-001
-    else:
-        return base_sku.replace("-", "")  # SKU001
-
-
-def messy_product_name(name: str) -> str:
-    """Corrupt encoding ~30%, add trailing whitespace ~20%."""
-    result = name
-    if random.random() < 0.30:
-        # encode as UTF-8 then decode as Latin-1 → mojibake
-        try:
-            result = name.encode("utf-8").decode("latin-1")
-        except (UnicodeDecodeError, UnicodeEncodeError):
-            pass
-    if random.random() < 0.20:
-        result = result + "   "
+def messy_skus(base_skus: np.ndarray) -> np.ndarray:
+    """Apply random casing/formatting to each SKU."""
+    choice = rng.integers(0, 4, size=len(base_skus))
+    return np.select(
+        [choice == 0, choice == 1, choice == 2],
+        [
+            base_skus,                        # original: SKU-001
+            np.char.lower(base_skus),         # sku-001
+            np.char.capitalize(base_skus),    # Sku-001
+        ],
+        default=np.char.replace(base_skus, "-", ""),  # SKU001
+    )
+
+
+def messy_product_names(idx: np.ndarray) -> np.ndarray:
+    """Corrupt encoding ~30%, add trailing whitespace ~20%.
+
+    `idx` indexes PRODUCT_NAMES; the mojibake variant is computed once per
+    name and gathered, rather than re-encoded on every row.
+    """
+    # encode as UTF-8 then decode as Latin-1 → mojibake
+    moj_lookup = {n: n.encode("utf-8").decode("latin-1") for n in PRODUCT_NAMES}
+    names = np.array(PRODUCT_NAMES, dtype=object)[idx]
+    moj_names = np.array([moj_lookup[n] for n in PRODUCT_NAMES], dtype=object)[idx]
+    mojibake = rng.random(len(idx)) < 0.30
+    result = np.where(mojibake, moj_names, names)
+    trailing = rng.random(len(idx)) < 0.20
+    result[trailing] = result[trailing] + "   "
     return result
 
 
-def messy_date(dt) -> str:
-    """Format a datetime with a randomly chosen format."""
-    fmt = random.choice(DATE_FORMATS)
-    return dt.strftime(fmt)
+def messy_dates(dts: pd.DatetimeIndex) -> np.ndarray:
+    """Format each datetime with a randomly chosen format, one strftime per format."""
+    fmt_idx = rng.integers(0, len(DATE_FORMATS), size=len(dts))
+    out = np.empty(len(dts), dtype=object)
+    for k, fmt in enumerate(DATE_FORMATS):
+        mask = fmt_idx == k
+        out[mask] = dts[mask].strftime(fmt)
+    return out
 
 
-def messy_price(value: float) -> str:
-    """Format a price with random currency/locale style."""
-    formatter = random.choice(PRICE_FORMATS)
-    return formatter(value)
+def messy_prices(values: np.ndarray) -> np.ndarray:
+    """Format prices with a random currency/locale style, one bulk op per style."""
+    base = np.char.mod("%.2f", values)
+    fmt_idx = rng.integers(0, len(PRICE_FORMATS), size=len(values))
+    out = np.empty(len(values), dtype=object)
+    for k, formatter in enumerate(PRICE_FORMATS):
+        mask = fmt_idx == k
+        out[mask] = formatter(base[mask])
+    return out
 
 
-def messy_quantity(qty: int):
-    """Return quantity as str, int, or float randomly."""
-    choice = random.randint(0, 2)
-    if choice == 0:
-        return str(qty)
-    elif choice == 1:
-        return qty
-    else:
-        return float(qty)
+def messy_quantities(qtys: np.ndarray) -> np.ndarray:
+    """Return each quantity as str, int, or float randomly."""
+    choice = rng.integers(0, 3, size=len(qtys))
+    out = qtys.astype(object)
+    out[choice == 0] = qtys[choice == 0].astype(str).astype(object)
+    out[choice == 2] = qtys[choice == 2].astype(float).astype(object)
+    return out
 
 
-def messy_email() -> str:
+def messy_emails(n: int) -> np.ndarray:
     """Pick a real email ~70% of the time, null variant ~30%."""
-    if random.random() < 0.70:
-        return random.choice(CUSTOMER_EMAILS)
-    else:
-        return random.choice(NULL_EMAIL_VARIANTS)
+    real = rng.random(n) < 0.70
+    emails = rng.choice(np.array(CUSTOMER_EMAILS, dtype=object), size=n)
+    nulls = rng.choice(np.array(NULL_EMAIL_VARIANTS, dtype=object), size=n)
+    return np.where(real, emails, nulls)
 
 
-def messy_phone():
+def messy_phones(n: int) -> np.ndarray:
     """Pick a formatted phone ~65% of the time, null variant ~35%."""
-    if random.random() < 0.65:
-        formatter = random.choice(PHONE_FORMATS)
-        return formatter()
-    else:
-        return random.choice(NULL_PHONE_VARIANTS)
+    real = rng.random(n) < 0.65
+    fmt_idx = rng.integers(0, len(PHONE_FORMATS), size=n)
+    d3 = rng.integers(100, 1000, size=n).astype(str)
+    d4 = rng.integers(1000, 10000, size=n).astype(str)
+    out = rng.choice(np.array(NULL_PHONE_VARIANTS, dtype=object), size=n)
+    for k, formatter in enumerate(PHONE_FORMATS):
+        mask = real & (fmt_idx == k)
+        out[mask] = formatter(d3[mask], d4[mask])
+    return out
 
 
 # ── main generation ──────────────────────────────────────────────────────────
@@ -170,50 +186,49 @@ def generate_dataset() -> pd.DataFrame:
     start = pd.Timestamp("2023-01-01")
     end = pd.Timestamp("2024-12-31")
     date_range_seconds = int((end - start).total_seconds())
-    random_offsets = np.random.randint(0, date_range_seconds, size=NUM_BASE_ROWS)
-    random_dates = [start + pd.Timedelta(seconds=int(s)) for s in random_offsets]
+    random_offsets = rng.integers(0, date_range_seconds, size=NUM_BASE_ROWS)
+    random_dates = start + pd.to_timedelta(random_offsets, unit="s")
 
     # pre-generate random prices
-    random_prices = np.random.uniform(4.99, 299.99, size=NUM_BASE_ROWS)
+    random_prices = rng.uniform(4.99, 299.99, size=NUM_BASE_ROWS)
 
     # pre-generate random quantities
-    random_quantities = np.random.randint(1, 21, size=NUM_BASE_ROWS)
-
-    rows = []
-    for i in range(NUM_BASE_ROWS):
-        base_sku = random.choice(BASE_SKUS)
-        base_name = PRODUCT_NAMES[BASE_SKUS.index(base_sku)]
-
-        row = {
-            "order_id": f"ORD-{10001 + i}",
-            "sku": messy_sku(base_sku),
-            "product_name": messy_product_name(base_name),
-            "order_date": messy_date(random_dates[i]),
-            "price": messy_price(random_prices[i]),
-            "quantity": messy_quantity(int(random_quantities[i])),
-            "customer_email": messy_email(),
-            "customer_phone": messy_phone(),
-            "shipping_country": random.choice(SHIPPING_COUNTRIES),
-            "status": random.choice(STATUS_VARIANTS),
-            "_unnamed_1": None,
-            "_unnamed_2": None,
-            "notes": None,
-        }
-        rows.append(row)
-
-        if (i + 1) % 30_000 == 0:
-            print(f"  ...generated {i + 1:,} rows")
-
-    df = pd.DataFrame(rows)
-
-    # ── inject duplicate rows ────────────────────────────────────────────────
+    random_quantities = rng.integers(1, 21, size=NUM_BASE_ROWS)
+
+    # build each column as a whole (no per-row dicts)
+    # one index draw selects both the SKU and its matching product name
+    sku_idx = rng.integers(0, len(BASE_SKUS), size=NUM_BASE_ROWS)
+    base_skus = np.array(BASE_SKUS)[sku_idx]
+    order_ids = np.char.add("ORD-", (np.arange(NUM_BASE_ROWS) + 10001).astype(str))
+    empty_col = [None] * NUM_BASE_ROWS
+
+    df = pd.DataFrame({
+        "order_id": order_ids,
+        "sku": messy_skus(base_skus),
+        "product_name": messy_product_names(sku_idx),
+        "order_date": messy_dates(random_dates),
+        "price": messy_prices(random_prices),
+        "quantity": messy_quantities(random_quantities),
+        "customer_email": messy_emails(NUM_BASE_ROWS),
+        "customer_phone": messy_phones(NUM_BASE_ROWS),
+        "shipping_country": rng.choice(SHIPPING_COUNTRIES, size=NUM_BASE_ROWS),
+        "status": rng.choice(STATUS_VARIANTS, size=NUM_BASE_ROWS),
+        "_unnamed_1": empty_col,
+        "_unnamed_2": empty_col,
+        "notes": empty_col,
+    })
+    print(f"  ...generated {NUM_BASE_ROWS:,} rows")
+
+    # ── inject duplicate rows + shuffle ──────────────────────────────────────
+    # Both are expressed as row positions and applied in a single gather,
+    # so the full frame is copied once rather than by concat and again by sample
     print(f"Injecting {NUM_DUPLICATE_ROWS:,} duplicate rows...")
-    duplicates = df.sample(n=NUM_DUPLICATE_ROWS, random_state=42)
-    df = pd.concat([df, duplicates], ignore_index=True)
+    dup_idx = rng.choice(NUM_BASE_ROWS, size=NUM_DUPLICATE_ROWS, replace=False)
+    row_idx = np.concatenate([np.arange(NUM_BASE_ROWS), dup_idx])
 
-    # ── shuffle ──────────────────────────────────────────────────────────────
     print("Shuffling...")
-    df = df.sample(frac=1, random_state=42).reset_index(drop=True)
+    row_idx = row_idx[rng.permutation(len(row_idx))]
+    df = df.iloc[row_idx].reset_index(drop=True)
 
     return df
 
@@ -223,8 +238,9 @@ def generate_dataset() -> pd.DataFrame:
 if __name__ == "__main__":
     df = generate_dataset()
 
-    # save
-    df.to_csv(OUTPUT_FILE, index=False)
+    # save — buffered handle so the chunked writer issues few large writes
+    with open(OUTPUT_FILE, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        df.to_csv(f, index=False, chunksize=65_536)
     print(f"\nSaved to {OUTPUT_FILE}")
 
     # summary